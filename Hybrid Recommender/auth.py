@@ -0,0 +1,171 @@
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# scrypt cost (N, r, p). The parameters are stored with every hash, so raising them later only
+# affects new and rehashed passwords. N=2**14, r=8 takes about 16 MB and tens of ms per hash.
+# Override with RECOMMENDER_SCRYPT_N / _R / _P (e.g. a cheaper cost for a load test run).
+SCRYPT_N = int(os.environ.get('RECOMMENDER_SCRYPT_N', 2 ** 14))
+SCRYPT_R = int(os.environ.get('RECOMMENDER_SCRYPT_R', 8))
+SCRYPT_P = int(os.environ.get('RECOMMENDER_SCRYPT_P', 1))
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# Session tokens are HMAC-signed with this key. Set RECOMMENDER_SECRET_KEY so that tokens stay
+# valid across restarts and worker processes; otherwise a random per-process key is used.
+# Revocations (logout) are kept in process memory only: with a shared key and several worker
+# processes, a logged-out token is refused by the worker that handled the logout but still
+# accepted by the others until it expires. Lower SESSION_TTL_SECONDS if that window matters.
+SECRET_KEY = os.environ.get('RECOMMENDER_SECRET_KEY', '').encode() or os.urandom(32)
+SESSION_TTL_SECONDS = 12 * 60 * 60
+MAX_CACHED_SESSIONS = 10000
+
+_sessions = OrderedDict()
+_revoked = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+# Salted scrypt hash, stored as "scrypt$N$r$p$salt$key"
+def hash_password(password, n=None, r=None, p=None):
+    n, r, p = n or SCRYPT_N, r or SCRYPT_R, p or SCRYPT_P
+    salt = os.urandom(SALT_BYTES)
+    key = hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=KEY_BYTES, maxmem=256 * n * r + 2 ** 20)
+    return f'scrypt${n}${r}${p}${_b64(salt)}${_b64(key)}'
+
+
+def verify_password(password, stored):
+    try:
+        scheme, n, r, p, salt, key = str(stored).split('$')
+        n, r, p = int(n), int(r), int(p)
+    except ValueError:
+        return False
+    if scheme != 'scrypt':
+        return False
+    candidate = hashlib.scrypt(password.encode(), salt=_unb64(salt), n=n, r=r, p=p, dklen=len(_unb64(key)),
+                               maxmem=256 * n * r + 2 ** 20)
+    return hmac.compare_digest(candidate, _unb64(key))
+
+
+# True when a stored hash was made with a different cost than the current settings
+def needs_rehash(stored):
+    parts = str(stored).split('$')
+    return len(parts) != 6 or parts[1:4] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+
+
+def _sign(payload):
+    return _b64(hmac.new(SECRET_KEY, payload.encode(), hashlib.sha256).digest())
+
+
+# Signed session token "user_id.expiry.nonce.signature", registered in the in-process cache
+def issue_token(user_id, ttl=SESSION_TTL_SECONDS):
+    expires = int(time.time()) + ttl
+    payload = f'{user_id}.{expires}.{_b64(os.urandom(9))}'
+    token = f'{payload}.{_sign(payload)}'
+    _remember(token, str(user_id), expires)
+    return token
+
+
+def _remember(token, user_id, expires):
+    with _sessions_lock:
+        _sessions[token] = (user_id, expires)
+        _sessions.move_to_end(token)
+        while len(_sessions) > MAX_CACHED_SESSIONS:
+            _sessions.popitem(last=False)
+
+
+# User ID for a valid token, else None. Cached tokens are answered from memory; others are
+# checked by signature and expiry only, so the user store is never read here.
+def validate_token(token):
+    if not token:
+        return None
+    now = time.time()
+    with _sessions_lock:
+        cached = _sessions.get(token)
+        if cached is not None:
+            if cached[1] > now:
+                _sessions.move_to_end(token)
+                return cached[0]
+            del _sessions[token]
+            return None
+        if token in _revoked:
+            return None
+
+    try:
+        payload, signature = token.rsplit('.', 1)
+        user_id, expires, _ = payload.split('.')
+        expires = int(expires)
+    except ValueError:
+        return None
+    if expires <= now or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    _remember(token, user_id, expires)
+    return user_id
+
+
+# Log out: forget the token here and refuse it until it would have expired anyway.
+# This only applies to the current process (see SECRET_KEY above).
+def revoke_token(token):
+    now = time.time()
+    with _sessions_lock:
+        _sessions.pop(token, None)
+        try:
+            expires = int(token.rsplit('.', 1)[0].split('.')[1])
+        except (AttributeError, IndexError, ValueError):
+            return
+        _revoked[token] = expires
+        while _revoked and (len(_revoked) > MAX_CACHED_SESSIONS or next(iter(_revoked.values())) <= now):
+            _revoked.popitem(last=False)
+
+
+# Logins/sec (one scrypt verify + token issue each) and token validations/sec under concurrency
+def benchmark_logins(logins=200, concurrency=8, n=None, r=None, p=None):
+    stored = hash_password('benchmark-password', n=n, r=r, p=p)
+
+    def login(index):
+        if not verify_password('benchmark-password', stored):
+            raise RuntimeError('verification failed')
+        return issue_token(index)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        tokens = list(pool.map(login, range(logins)))
+    login_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(validate_token, tokens * 50))
+    validate_seconds = time.perf_counter() - start
+
+    return {
+        'scrypt': stored.split('$')[1:4],
+        'concurrency': concurrency,
+        'logins_per_s': round(logins / login_seconds, 1),
+        'ms_per_login': round(login_seconds / logins * concurrency * 1000, 2),
+        'cached_validations_per_s': round(len(tokens) * 50 / validate_seconds),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark password hashing and session validation')
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--n', type=int, nargs='+', default=[2 ** 12, 2 ** 14, 2 ** 15])
+    args = parser.parse_args()
+
+    for n in args.n:
+        for concurrency in args.concurrency:
+            print(benchmark_logins(args.logins, concurrency, n=n))
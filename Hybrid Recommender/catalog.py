@@ -0,0 +1,89 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+
+# File paths for the collaborative dataset
+DESTINATIONS_FILE_PATH = os.path.join('..', 'Collaborative Recommender Models', 'Expanded_Destinations.csv')
+REVIEWS_FILE_PATH = os.path.join('..', 'Collaborative Recommender Models', 'Final_Updated_Expanded_Reviews.csv')
+
+
+# Canonical form of a destination name: trimmed, single-spaced and case-folded
+def canonical_name(names):
+    return names.fillna('').str.strip().str.replace(r'\s+', ' ', regex=True).str.casefold()
+
+
+# Collapse destinations listed under several DestinationIDs into one catalog entry each
+def build_catalog(destinations):
+    destinations = destinations.dropna(subset=['DestinationID']).copy()
+    destinations['DestinationID'] = destinations['DestinationID'].astype(np.int32)
+    keys = canonical_name(destinations['Name']) + '|' + canonical_name(destinations['State'])
+    codes, _ = pd.factorize(keys)
+    destinations['PlaceCode'] = codes.astype(np.int32)
+
+    catalog = destinations.groupby('PlaceCode', sort=True).agg(
+        Name=('Name', lambda names: names.str.strip().iloc[0]),
+        State=('State', 'first'),
+        Type=('Type', 'first'),
+        Popularity=('Popularity', 'mean'),
+        BestTimeToVisit=('BestTimeToVisit', 'first'),
+        SourceIDs=('DestinationID', 'size'),
+    ).reset_index()
+
+    # Dense lookup table: id_map[DestinationID] -> PlaceCode, -1 for unknown IDs
+    id_map = np.full(destinations['DestinationID'].max() + 1, -1, dtype=np.int32)
+    id_map[destinations['DestinationID'].to_numpy()] = destinations['PlaceCode'].to_numpy()
+    return catalog, id_map
+
+
+# Rewrite the review table with int32 place and user codes instead of raw IDs and names
+def encode_reviews(reviews, id_map):
+    destination_ids = reviews['DestinationID'].to_numpy(dtype=np.int64)
+    known = (destination_ids >= 0) & (destination_ids < len(id_map))
+    place_codes = np.full(len(reviews), -1, dtype=np.int32)
+    place_codes[known] = id_map[destination_ids[known]]
+
+    keep = place_codes >= 0
+    reviews = reviews[keep]
+    user_codes, user_ids = pd.factorize(reviews['UserID'])
+    encoded = pd.DataFrame({
+        'ReviewID': reviews['ReviewID'].to_numpy(dtype=np.int32),
+        'PlaceCode': place_codes[keep],
+        'UserCode': user_codes.astype(np.int32),
+        'Rating': reviews['Rating'].to_numpy(dtype=np.int8),
+    })
+    return encoded, pd.Index(user_ids, name='UserID')
+
+
+# Place x user rating matrix built by direct integer indexing; repeated ratings are averaged
+def rating_csr(encoded, n_places, n_users):
+    rows = encoded['PlaceCode'].to_numpy()
+    cols = encoded['UserCode'].to_numpy()
+    shape = (n_places, n_users)
+    totals = coo_matrix((encoded['Rating'].to_numpy(dtype=np.float32), (rows, cols)), shape=shape).tocsr()
+    counts = coo_matrix((np.ones(len(encoded), dtype=np.float32), (rows, cols)), shape=shape).tocsr()
+    totals.data /= counts.data
+    return totals
+
+
+def load_collaborative_dataset(destinations_path=DESTINATIONS_FILE_PATH, reviews_path=REVIEWS_FILE_PATH):
+    destinations = pd.read_csv(destinations_path)
+    reviews = pd.read_csv(reviews_path, usecols=['ReviewID', 'DestinationID', 'UserID', 'Rating'],
+                          dtype={'ReviewID': 'int32', 'DestinationID': 'int32', 'UserID': 'int32', 'Rating': 'int32'})
+    catalog, id_map = build_catalog(destinations)
+    encoded, user_ids = encode_reviews(reviews, id_map)
+    ratings = rating_csr(encoded, len(catalog), len(user_ids))
+    return catalog, encoded, user_ids, ratings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write the deduplicated catalog and integer-coded reviews')
+    parser.add_argument('--output-dir', default='.')
+    args = parser.parse_args()
+
+    catalog, encoded, user_ids, ratings = load_collaborative_dataset()
+    catalog.to_csv(os.path.join(args.output_dir, 'Destination_Catalog.csv'), index=False)
+    encoded.to_csv(os.path.join(args.output_dir, 'Encoded_Reviews.csv'), index=False)
+    print(f'{len(catalog)} catalog places, {len(user_ids)} users, {ratings.nnz} place-user ratings')
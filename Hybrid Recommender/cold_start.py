@@ -0,0 +1,125 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Bounded per-user cache of taste profiles (least recently used profiles are evicted first)
+MAX_CACHED_PROFILES = 10000
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+# Split the comma-separated Places_Visited field captured at registration
+def parse_places_visited(places_visited):
+    if not isinstance(places_visited, str):
+        return []
+    return [name.strip() for name in places_visited.split(',') if name.strip()]
+
+
+# Pair each visited place with its rating from Ratings_Given. A single rating (the registration
+# slider) applies to every place; a comma-separated list pairs up by position, and places left
+# without a rating get None (extra ratings are ignored).
+def parse_visits(places_visited, ratings_given):
+    names = parse_places_visited(places_visited)
+    if isinstance(ratings_given, str):
+        ratings = pd.to_numeric(pd.Series(parse_places_visited(ratings_given), dtype=object), errors='coerce')
+        ratings = [None if pd.isna(rating) else float(rating) for rating in ratings]
+    elif ratings_given is None or pd.isna(ratings_given):
+        ratings = []
+    else:
+        ratings = [float(ratings_given)]
+    if len(ratings) == 1:
+        ratings = ratings * len(names)
+    return list(zip(names, ratings + [None] * (len(names) - len(ratings))))
+
+
+# Profile weight of a rating on the 1-5 scale: centred on 3, so low ratings push the taste vector
+# away from a place. A visit without a rating counts as a liked place.
+def rating_weight(rating):
+    if rating is None:
+        return 1.0
+    return float(np.clip((float(rating) - 3.0) / 2.0, -1.0, 1.0))
+
+
+# Map trimmed, case-folded place names to their row in the TF-IDF matrix
+def build_place_positions(place_names):
+    positions = {}
+    for position, name in enumerate(place_names):
+        positions.setdefault(str(name).strip().casefold(), position)
+    return positions
+
+
+# Taste profile for a registered user: rating-weighted sum of TF-IDF rows and the total absolute
+# weight behind it (the same weighting update_profile uses for later ratings)
+def build_profile(user_row, tfidf_matrix, place_positions, place_categories, teen_categories, senior_categories):
+    weights = {}
+    for name, rating in parse_visits(user_row.get('Places_Visited'), user_row.get('Ratings_Given')):
+        position = place_positions.get(name.casefold())
+        if position is not None:
+            weights[position] = rating_weight(rating)
+    visited = sorted(weights)
+    rows = [position for position in visited if weights[position] != 0]
+    row_weights = np.array([weights[position] for position in rows], dtype=np.float32)
+
+    # Nothing recognisable (or only neutral ratings): seed the profile from the age group's categories
+    age = pd.to_numeric(user_row.get('Age'), errors='coerce')
+    if not rows and not pd.isna(age):
+        group = teen_categories if age < 40 else senior_categories
+        group = {category.casefold() for category in group}
+        categories = pd.Series(place_categories).fillna('').str.casefold()
+        rows = np.flatnonzero(categories.isin(group).to_numpy()).tolist()
+        row_weights = np.ones(len(rows), dtype=np.float32)
+
+    if not rows:
+        return None
+    return {
+        'vector_sum': np.asarray(tfidf_matrix[rows].T @ row_weights, dtype=np.float32).ravel(),
+        'weight': float(np.abs(row_weights).sum()),
+        # Only places the user actually visited are excluded, never the age-seeded ones
+        'seen': set(visited),
+    }
+
+
+# Cached profile lookup; build() is only called on a miss and None results are not cached
+def get_profile(user_id, build):
+    with _profiles_lock:
+        if user_id in _profiles:
+            _profiles.move_to_end(user_id)
+            return _profiles[user_id]
+
+    profile = build()
+    if profile is None:
+        return None
+
+    with _profiles_lock:
+        profile = _profiles.setdefault(user_id, profile)
+        _profiles.move_to_end(user_id)
+        while len(_profiles) > MAX_CACHED_PROFILES:
+            _profiles.popitem(last=False)
+    return profile
+
+
+# Fold one new rating into a cached profile without rebuilding it (ratings are on a 1-5 scale)
+def update_profile(user_id, position, rating, tfidf_matrix):
+    weight = rating_weight(rating)
+    row = np.asarray(tfidf_matrix[position].todense(), dtype=np.float32).ravel()
+    with _profiles_lock:
+        profile = _profiles.get(user_id)
+        if profile is None:
+            return None
+        profile['vector_sum'] += weight * row
+        profile['weight'] += abs(weight)
+        profile['seen'].add(position)
+        return profile
+
+
+def clear_profiles():
+    with _profiles_lock:
+        _profiles.clear()
+
+
+# Score every place against the user's mean taste vector: one sparse matrix-vector product
+def score_profile(profile, tfidf_matrix):
+    taste = profile['vector_sum'] / max(profile['weight'], 1e-9)
+    return np.asarray(tfidf_matrix @ taste).ravel()
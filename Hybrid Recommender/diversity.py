@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+
+# Pairwise cosine similarity inside the candidate pool only, from the (L2-normalised) TF-IDF rows.
+# Places without a TF-IDF row get a zero vector, i.e. they are never considered near-duplicates.
+def pool_similarity(place_names, tfidf_matrix, place_positions):
+    positions = np.array([place_positions.get(str(name).strip().casefold(), -1) for name in place_names])
+    known = np.flatnonzero(positions >= 0)
+    similarity = np.zeros((len(place_names), len(place_names)), dtype=np.float32)
+    if known.size:
+        rows = tfidf_matrix[positions[known]]
+        similarity[np.ix_(known, known)] = (rows @ rows.T).toarray()
+    return similarity
+
+
+# Maximal marginal relevance over the top pool_size candidates: each pick trades the candidate's
+# relevance against its similarity to what is already picked (diversity=0 keeps the score order)
+def mmr_rerank(scores, tfidf_matrix, place_positions, diversity=0.3, top_n=10, pool_size=100):
+    pool = scores.sort_values(ascending=False).head(pool_size)
+    if diversity <= 0 or len(pool) <= 1:
+        return pool.head(top_n)
+
+    values = pool.to_numpy(dtype=np.float64)
+    spread = values.max() - values.min()
+    relevance = (values - values.min()) / spread if spread > 0 else np.ones_like(values)
+    similarity = pool_similarity(pool.index, tfidf_matrix, place_positions)
+
+    selected = []
+    closest = np.zeros(len(pool))
+    available = np.ones(len(pool), dtype=bool)
+    for _ in range(min(top_n, len(pool))):
+        marginal = np.where(available, (1 - diversity) * relevance - diversity * closest, -np.inf)
+        pick = int(np.argmax(marginal))
+        selected.append(pick)
+        available[pick] = False
+        closest = np.maximum(closest, similarity[pick])
+    return pd.Series(values[selected], index=pool.index[selected], name=scores.name)
@@ -0,0 +1,252 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, diags
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity, sigmoid_kernel
+
+from catalog import load_collaborative_dataset
+
+# File path for the hybrid evaluation dataset
+FINAL_DATASET_PATH = 'Final Dataset.csv'
+
+
+# Load a ratings table as integer-coded (user, item) interactions
+def load_interactions(path, user_col, item_col, rating_col, order_col=None):
+    columns = [user_col, item_col, rating_col] + ([order_col] if order_col else [])
+    frame = pd.read_csv(path, usecols=columns).dropna(subset=[user_col, item_col])
+    frame = frame.reset_index(drop=True)
+    order = frame[order_col].to_numpy() if order_col else np.arange(len(frame))
+
+    user_codes, user_ids = pd.factorize(frame[user_col])
+    item_codes, item_ids = pd.factorize(frame[item_col])
+    interactions = make_interactions(user_codes, item_codes, frame[rating_col], order)
+    return interactions, pd.Index(user_ids), pd.Index(item_ids)
+
+
+# Keep the latest rating when a user rated the same item more than once
+def make_interactions(users, items, ratings, order):
+    interactions = pd.DataFrame({
+        'user': np.asarray(users, dtype=np.int32),
+        'item': np.asarray(items, dtype=np.int32),
+        'rating': np.asarray(ratings, dtype=np.float32),
+        'order': np.asarray(order),
+    })
+    interactions = interactions.sort_values('order', kind='stable')
+    interactions = interactions.drop_duplicates(subset=['user', 'item'], keep='last')
+    return interactions.reset_index(drop=True)
+
+
+# Hold out one random interaction per user (users with a single rating stay in train)
+def leave_one_out_split(interactions, seed=42):
+    rng = np.random.default_rng(seed)
+    shuffled = interactions.assign(_key=rng.random(len(interactions)))
+    shuffled = shuffled.sort_values(['user', '_key'])
+    position = shuffled.groupby('user').cumcount().to_numpy()
+    counts = shuffled.groupby('user')['item'].transform('size').to_numpy()
+    is_test = (position == 0) & (counts > 1)
+    shuffled = shuffled.drop(columns='_key')
+    return shuffled[~is_test], shuffled[is_test]
+
+
+# Hold out the most recent fraction of each user's interactions
+def temporal_split(interactions, test_fraction=0.2):
+    ordered = interactions.sort_values(['user', 'order'], kind='stable')
+    position = ordered.groupby('user').cumcount().to_numpy()
+    counts = ordered.groupby('user')['item'].transform('size').to_numpy()
+    n_test = np.floor(counts * test_fraction).astype(int)
+    n_test = np.where((n_test == 0) & (counts > 1), 1, n_test)
+    is_test = position >= counts - n_test
+    return ordered[~is_test], ordered[is_test]
+
+
+def to_csr(interactions, n_users, n_items, binary=False):
+    values = np.ones(len(interactions), dtype=np.float32) if binary else interactions['rating'].to_numpy(dtype=np.float32)
+    return csr_matrix(
+        (values, (interactions['user'].to_numpy(), interactions['item'].to_numpy())),
+        shape=(n_users, n_items),
+    )
+
+
+# Top-k item indices per row, best first, never recommending already seen items
+def top_k_items(scores, seen, k):
+    scores = np.array(scores, dtype=np.float32, copy=True)
+    scores[seen.nonzero()] = -np.inf
+    k = min(k, scores.shape[1])
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+# Precision@k, recall@k, NDCG@k and AP@k for a batch of users, summed over the batch
+def ranking_metric_sums(top_k, relevant, k):
+    hits = np.asarray(relevant[np.arange(top_k.shape[0])[:, None], top_k]).astype(np.float32)
+    n_relevant = np.asarray(relevant.sum(axis=1)).ravel()
+    mask = n_relevant > 0
+    hits, n_relevant = hits[mask], n_relevant[mask]
+
+    ranks = np.arange(1, k + 1, dtype=np.float32)
+    discounts = 1.0 / np.log2(ranks + 1)
+    ideal_len = np.minimum(n_relevant, k).astype(int)
+    ideal_dcg = np.cumsum(discounts)[ideal_len - 1]
+    n_hits = hits.sum(axis=1)
+
+    return {
+        'precision': (n_hits / k).sum(),
+        'recall': (n_hits / n_relevant).sum(),
+        'ndcg': ((hits @ discounts) / ideal_dcg).sum(),
+        'map': ((hits * np.cumsum(hits, axis=1) / ranks).sum(axis=1) / ideal_len).sum(),
+        'users': mask.sum(),
+    }
+
+
+# Evaluate a scorer over all test users in batches; score_fn(train_rows) -> dense scores
+def evaluate(score_fn, train, test, n_users, n_items, k=10, batch_size=2048):
+    if k >= n_items:
+        warnings.warn(f'k={k} covers all {n_items} items, so recall@{min(k, n_items)} is trivially 1.0 '
+                      'and the metrics do not compare rankings', stacklevel=2)
+    k = min(k, n_items)
+    train_csr = to_csr(train, n_users, n_items)
+    test_csr = to_csr(test, n_users, n_items, binary=True)
+    test_users = np.unique(test['user'].to_numpy())
+
+    totals = dict.fromkeys(['precision', 'recall', 'ndcg', 'map', 'users'], 0.0)
+    for start in range(0, len(test_users), batch_size):
+        batch = test_users[start:start + batch_size]
+        train_rows = train_csr[batch]
+        top_k = top_k_items(score_fn(train_rows), train_rows, k)
+        relevant = test_csr[batch].toarray().astype(bool)
+        for name, value in ranking_metric_sums(top_k, relevant, k).items():
+            totals[name] += value
+
+    n_evaluated = max(totals.pop('users'), 1)
+    results = {f'{name}@{k}': value / n_evaluated for name, value in totals.items()}
+    results['users'] = int(n_evaluated)
+    return results
+
+
+# Scorers: each builds its model from the training split and returns score_fn
+def popularity_scorer(train_csr):
+    popularity = np.asarray((train_csr > 0).sum(axis=0), dtype=np.float32)
+    return lambda rows: np.repeat(popularity, rows.shape[0], axis=0)
+
+
+def item_similarity_scorer(similarity):
+    similarity = np.asarray(similarity, dtype=np.float32)
+    np.fill_diagonal(similarity, 0.0)
+    return lambda rows: np.asarray((rows > 0).astype(np.float32) @ similarity)
+
+
+# Item-item kNN as in the collaborative notebook (cosine over the place x user matrix)
+def knn_similarity(train_csr, n_neighbors=20):
+    similarity = cosine_similarity(train_csr.T.tocsr(), dense_output=True).astype(np.float32)
+    np.fill_diagonal(similarity, 0.0)
+    if n_neighbors and n_neighbors < similarity.shape[1]:
+        cutoff = np.partition(similarity, -n_neighbors, axis=1)[:, -n_neighbors][:, None]
+        similarity[similarity < cutoff] = 0.0
+    return similarity
+
+
+# Collaborative similarity as in recommender.py: per-user z-scored ratings, cosine over places.
+# With Z = D (R - m 1^T), Z^T Z = (DR)^T (DR) - u 1^T - 1 u^T + c where u = R^T D^2 m and
+# c = m^T D^2 m, so the dense user x place matrix is never built.
+def normalized_collab_similarity(train_csr):
+    ratings = train_csr.tocsr().astype(np.float64)
+    n_items = ratings.shape[1]
+    mean = np.asarray(ratings.sum(axis=1)).ravel() / n_items
+    sum_squares = np.asarray(ratings.multiply(ratings).sum(axis=1)).ravel()
+    variance = np.maximum(sum_squares - n_items * mean ** 2, 0) / max(n_items - 1, 1)
+    scale = 1.0 / (np.sqrt(variance) + 1e-9)
+
+    scaled = diags(scale) @ ratings
+    u = ratings.T @ (scale ** 2 * mean)
+    c = float((scale * mean) @ (scale * mean))
+    gram = (scaled.T @ scaled).toarray() - u[:, None] - u[None, :] + c
+
+    norms = np.sqrt(np.maximum(np.diag(gram), 0))
+    norms[norms == 0] = 1.0
+    return (gram / norms[:, None] / norms[None, :]).astype(np.float32)
+
+
+# Content similarity as in the content-based notebook (sigmoid kernel over TF-IDF of Place_desc)
+def notebook_content_similarity(descriptions):
+    tfv = TfidfVectorizer(min_df=3, max_features=None,
+                          strip_accents='unicode', analyzer='word', token_pattern=r'\w{1,}',
+                          ngram_range=(1, 3),
+                          stop_words='english')
+    tfv_matrix = tfv.fit_transform(descriptions.fillna(''))
+    return sigmoid_kernel(tfv_matrix, tfv_matrix).astype(np.float32)
+
+
+def evaluate_final_dataset(split='loo', k=10, alpha=0.5):
+    from recommender import active_model
+    content_similarity_df = active_model().content_similarity_df
+
+    interactions, _, place_names = load_interactions(FINAL_DATASET_PATH, 'User_Id', 'Place_Name', 'User_Rating')
+    train, test = split_interactions(interactions, split)
+    n_users, n_items = interactions['user'].max() + 1, len(place_names)
+    train_csr = to_csr(train, n_users, n_items)
+
+    # Align the served content model to the evaluation item codes (unknown places get zero similarity)
+    content = content_similarity_df.reindex(index=place_names, columns=place_names).fillna(0).to_numpy(dtype=np.float32)
+    collab = normalized_collab_similarity(train_csr)
+
+    descriptions = pd.read_csv(FINAL_DATASET_PATH, usecols=['Place_Name', 'Place_desc'])
+    descriptions = descriptions.drop_duplicates(subset=['Place_Name']).set_index('Place_Name')['Place_desc']
+
+    scorers = {
+        'popularity': popularity_scorer(train_csr),
+        'hybrid': item_similarity_scorer(alpha * content + (1 - alpha) * collab),
+        'content (notebook)': item_similarity_scorer(notebook_content_similarity(descriptions.reindex(place_names))),
+        'knn (notebook)': item_similarity_scorer(knn_similarity(train_csr)),
+    }
+    return run_scorers(scorers, train, test, n_users, n_items, k)
+
+
+# Reviews are evaluated over the deduplicated catalog, so repeated DestinationIDs count as one place
+def evaluate_reviews_dataset(split='temporal', k=10):
+    catalog, encoded, user_ids, _ = load_collaborative_dataset()
+    interactions = make_interactions(encoded['UserCode'], encoded['PlaceCode'], encoded['Rating'], encoded['ReviewID'])
+    train, test = split_interactions(interactions, split)
+    n_users, n_items = len(user_ids), len(catalog)
+    train_csr = to_csr(train, n_users, n_items)
+
+    scorers = {
+        'popularity': popularity_scorer(train_csr),
+        'knn (notebook)': item_similarity_scorer(knn_similarity(train_csr)),
+    }
+    return run_scorers(scorers, train, test, n_users, n_items, k)
+
+
+def split_interactions(interactions, split):
+    if split == 'loo':
+        return leave_one_out_split(interactions)
+    if split == 'temporal':
+        return temporal_split(interactions)
+    raise ValueError(f"Unknown split '{split}', expected 'loo' or 'temporal'")
+
+
+def run_scorers(scorers, train, test, n_users, n_items, k):
+    rows = {}
+    for name, score_fn in scorers.items():
+        start = time.perf_counter()
+        rows[name] = evaluate(score_fn, train, test, n_users, n_items, k=k)
+        rows[name]['seconds'] = round(time.perf_counter() - start, 3)
+    return pd.DataFrame(rows).T
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Offline ranking evaluation for the recommenders')
+    parser.add_argument('--dataset', choices=['final', 'reviews'], default='final')
+    parser.add_argument('--split', choices=['loo', 'temporal'], default='loo')
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.dataset == 'final':
+        print(evaluate_final_dataset(split=args.split, k=args.k).to_string())
+    else:
+        print(evaluate_reviews_dataset(split=args.split, k=args.k).to_string())
@@ -0,0 +1,115 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+
+
+# Solve the regularized least-squares step for every row of a CSR rating matrix
+def _solve_rows(ratings, fixed_factors, reg):
+    n_factors = fixed_factors.shape[1]
+    solved = np.zeros((ratings.shape[0], n_factors), dtype=np.float32)
+    eye = np.eye(n_factors, dtype=np.float32)
+    for row in range(ratings.shape[0]):
+        start, end = ratings.indptr[row], ratings.indptr[row + 1]
+        if start == end:
+            continue
+        factors = fixed_factors[ratings.indices[start:end]]
+        gram = factors.T @ factors + reg * (end - start) * eye
+        solved[row] = np.linalg.solve(gram, factors.T @ ratings.data[start:end])
+    return solved
+
+
+# Alternating least squares on the observed entries of a sparse user x place matrix
+def fit_als(ratings, n_factors=32, reg=0.1, n_iters=10, seed=0):
+    ratings = csr_matrix(ratings, dtype=np.float32)
+    ratings.eliminate_zeros()
+    ratings_t = ratings.T.tocsr()
+
+    rng = np.random.default_rng(seed)
+    user_factors = np.zeros((ratings.shape[0], n_factors), dtype=np.float32)
+    item_factors = rng.normal(scale=0.1, size=(ratings.shape[1], n_factors)).astype(np.float32)
+    for _ in range(n_iters):
+        user_factors = _solve_rows(ratings, item_factors, reg)
+        item_factors = _solve_rows(ratings_t, user_factors, reg)
+    return user_factors, item_factors
+
+
+# Fold a new (or updated) user into a trained model without retraining
+def fold_in_user(item_factors, item_indices, ratings, reg=0.1):
+    item_indices = np.asarray(item_indices, dtype=np.int64)
+    ratings = np.asarray(ratings, dtype=np.float32)
+    if len(item_indices) == 0:
+        return np.zeros(item_factors.shape[1], dtype=np.float32)
+    factors = item_factors[item_indices]
+    gram = factors.T @ factors + reg * len(item_indices) * np.eye(item_factors.shape[1], dtype=np.float32)
+    return np.linalg.solve(gram, factors.T @ ratings).astype(np.float32)
+
+
+# Predicted affinity of one user for every place: a single matrix-vector product
+def score_user(item_factors, user_vector):
+    return item_factors @ user_vector
+
+
+# Unit-length place factors, so place-place cosine is also a single matrix-vector product
+def normalize_factors(item_factors):
+    norms = np.linalg.norm(item_factors, axis=1, keepdims=True)
+    return item_factors / np.maximum(norms, 1e-9)
+
+
+def similar_items(normalized_item_factors, item_index):
+    return normalized_item_factors @ normalized_item_factors[item_index]
+
+
+# Compare memory, latency and accuracy of the item-item cosine path and the ALS path
+def benchmark_collab_backends(path, user_col, item_col, rating_col, n_factors=32, reg=0.1, k=10, n_queries=200):
+    from sklearn.metrics.pairwise import cosine_similarity
+    import evaluation
+
+    interactions, _, item_ids = evaluation.load_interactions(path, user_col, item_col, rating_col)
+    train, test = evaluation.leave_one_out_split(interactions)
+    n_users, n_items = interactions['user'].max() + 1, len(item_ids)
+    train_csr = evaluation.to_csr(train, n_users, n_items)
+    queries = np.random.default_rng(0).integers(0, n_items, n_queries)
+    results = {}
+
+    start = time.perf_counter()
+    similarity = cosine_similarity(train_csr.T.tocsr(), dense_output=True).astype(np.float32)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for item in queries:
+        np.argsort(-similarity[:, item])[:k]
+    results['item-item'] = {
+        'build_s': build_seconds,
+        'model_mb': similarity.nbytes / 2 ** 20,
+        'query_ms': (time.perf_counter() - start) / n_queries * 1000,
+        **evaluation.evaluate(evaluation.item_similarity_scorer(similarity), train, test, n_users, n_items, k=k),
+    }
+
+    start = time.perf_counter()
+    user_factors, item_factors = fit_als(train_csr, n_factors=n_factors, reg=reg)
+    normalized = normalize_factors(item_factors)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for item in queries:
+        np.argsort(-similar_items(normalized, item))[:k]
+    results['als'] = {
+        'build_s': build_seconds,
+        'model_mb': (user_factors.nbytes + item_factors.nbytes) / 2 ** 20,
+        'query_ms': (time.perf_counter() - start) / n_queries * 1000,
+        **evaluation.evaluate(lambda rows: _solve_rows(rows, item_factors, reg) @ item_factors.T,
+                              train, test, n_users, n_items, k=k),
+    }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the item-item and ALS collaborative backends')
+    parser.add_argument('--path', default='Final Dataset.csv')
+    parser.add_argument('--columns', nargs=3, default=['User_Id', 'Place_Name', 'User_Rating'],
+                        metavar=('USER', 'ITEM', 'RATING'))
+    parser.add_argument('--factors', type=int, default=32)
+    args = parser.parse_args()
+
+    print(pd.DataFrame(benchmark_collab_backends(args.path, *args.columns, n_factors=args.factors)).T.to_string())
@@ -0,0 +1,223 @@
+import argparse
+import itertools
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# File path for the city metadata (Ideal_duration)
+CITY_FILE_PATH = os.path.join('..', 'Content-Based Recommender Models', 'City.csv')
+
+# Spreadsheet exports turned day ranges such as "2-4" into dates such as "02-Apr"
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+
+# "12 km  from city center" -> 12.0; entries without a distance become NaN
+def parse_distance_km(distances):
+    return pd.to_numeric(pd.Series(distances).astype(str).str.extract(r'([\d.]+)\s*km', expand=False),
+                         errors='coerce').to_numpy(dtype=np.float64)
+
+
+# "02-Apr" -> (2, 4), "1" -> (1, 1)
+def parse_ideal_duration(value):
+    parts = re.split(r'\s*[-–]\s*', str(value).strip().lower())
+    days = []
+    for part in parts:
+        if part.isdigit():
+            days.append(int(part))
+        elif part[:3] in MONTHS:
+            days.append(MONTHS[part[:3]])
+    if not days:
+        return None
+    return min(days), max(days)
+
+
+# Places without a parsable distance are assumed to be as far out as the city's median place
+def fill_missing_distances(distances):
+    distances = np.asarray(distances, dtype=np.float64)
+    if not np.isfinite(distances).any():
+        return np.zeros_like(distances)
+    return np.where(np.isnan(distances), np.nanmedian(distances), distances)
+
+
+def load_ideal_durations(path=CITY_FILE_PATH):
+    if not os.path.exists(path):
+        return {}
+    cities = pd.read_csv(path, usecols=['City', 'Ideal_duration'])
+    durations = {}
+    for city, value in zip(cities['City'], cities['Ideal_duration']):
+        parsed = parse_ideal_duration(value)
+        if parsed:
+            durations[str(city).strip().lower()] = parsed
+    return durations
+
+
+# Pairwise travel estimate with the city center as node 0. Only the distance from the center is
+# known, so the distance between two places lies between |d_i - d_j| and d_i + d_j; the midpoint
+# of those bounds is max(d_i, d_j).
+def travel_matrix(distances):
+    nodes = np.concatenate([[0.0], np.asarray(distances, dtype=np.float64)])
+    travel = np.maximum.outer(nodes, nodes)
+    np.fill_diagonal(travel, 0.0)
+    return travel
+
+
+def route_km(route, travel):
+    route = np.asarray(route)
+    return travel[route[:-1], route[1:]].sum()
+
+
+# Best-improvement 2-opt on a closed route that starts and ends at the center
+def two_opt(route, travel):
+    route = list(route)
+    while len(route) > 4:
+        r = np.asarray(route)
+        i, j = np.triu_indices(len(r) - 1, k=1)
+        valid = i >= 1
+        i, j = i[valid], j[valid]
+        delta = (travel[r[i - 1], r[j]] + travel[r[i], r[j + 1]]
+                 - travel[r[i - 1], r[i]] - travel[r[j], r[j + 1]])
+        best = np.argmin(delta)
+        if delta[best] >= -1e-9:
+            break
+        a, b = i[best], j[best]
+        route[a:b + 1] = route[a:b + 1][::-1]
+    return route
+
+
+# Greedy cheapest insertion by score per hour spent, under per-day time and distance budgets.
+# Nodes are 1-based (0 is the center); returns one closed route per day.
+def greedy_routes(scores, travel, days, hours_per_day=8.0, visit_hours=1.5, speed_kmh=30.0, max_km_per_day=150.0):
+    scores = np.asarray(scores, dtype=np.float64)
+    routes = [[0, 0] for _ in range(days)]
+    remaining = np.flatnonzero(scores > 0) + 1
+
+    def hours(route):
+        return (len(route) - 2) * visit_hours + route_km(route, travel) / speed_kmh
+
+    while remaining.size:
+        best = None
+        for day, route in enumerate(routes):
+            r = np.asarray(route)
+            extra_km = (travel[np.ix_(r[:-1], remaining)] + travel[np.ix_(r[1:], remaining)]
+                        - travel[r[:-1], r[1:]][:, None])
+            position = np.argmin(extra_km, axis=0)
+            extra_km = extra_km[position, np.arange(remaining.size)]
+            extra_hours = visit_hours + extra_km / speed_kmh
+            feasible = ((route_km(r, travel) + extra_km <= max_km_per_day)
+                        & (hours(r) + extra_hours <= hours_per_day))
+            if not feasible.any():
+                continue
+            value = np.where(feasible, scores[remaining - 1] / extra_hours, -np.inf)
+            pick = np.argmax(value)
+            if best is None or value[pick] > best[0]:
+                best = (value[pick], day, position[pick] + 1, pick)
+
+        if best is None:
+            # Shorter routes can free budget for one more place
+            improved = [two_opt(route, travel) for route in routes]
+            if all(route_km(a, travel) >= route_km(b, travel) - 1e-9 for a, b in zip(routes, improved)):
+                break
+            routes = improved
+            continue
+
+        _, day, position, pick = best
+        routes[day].insert(position, remaining[pick])
+        remaining = np.delete(remaining, pick)
+
+    return [two_opt(route, travel) for route in routes]
+
+
+# Exact search for small inputs: best route per subset, then best disjoint subsets across days
+def exhaustive_routes(scores, travel, days, hours_per_day=8.0, visit_hours=1.5, speed_kmh=30.0, max_km_per_day=150.0):
+    n = len(scores)
+    best_route = {0: [0, 0]}
+    for size in range(1, n + 1):
+        if size * visit_hours > hours_per_day:
+            break
+        for subset in itertools.combinations(range(1, n + 1), size):
+            shortest = min(([0, *order, 0] for order in itertools.permutations(subset)),
+                           key=lambda route: route_km(route, travel))
+            km = route_km(shortest, travel)
+            if km <= max_km_per_day and size * visit_hours + km / speed_kmh <= hours_per_day:
+                best_route[sum(1 << (node - 1) for node in subset)] = shortest
+
+    subset_score = {mask: sum(scores[node - 1] for node in route[1:-1]) for mask, route in best_route.items()}
+    plans = {0: (0.0, [])}
+    for _ in range(days):
+        extended = dict(plans)
+        for used, (total, chosen) in plans.items():
+            for mask, score in subset_score.items():
+                if mask and not mask & used:
+                    combined = used | mask
+                    if combined not in extended or extended[combined][0] < total + score:
+                        extended[combined] = (total + score, chosen + [mask])
+        plans = extended
+
+    _, chosen = max(plans.values(), key=lambda plan: plan[0])
+    routes = [best_route[mask] for mask in chosen]
+    return routes + [[0, 0]] * (days - len(routes))
+
+
+def routes_score(routes, scores):
+    return float(sum(scores[node - 1] for route in routes for node in route[1:-1]))
+
+
+# Multi-day plan for one city as a table of (Day, Stop, Place_Name, Score, Distance_km)
+def plan_itinerary(place_names, scores, distances, days, **budgets):
+    distances = fill_missing_distances(distances)
+    scores = np.asarray(scores, dtype=np.float64)
+    routes = greedy_routes(scores, travel_matrix(distances), days, **budgets)
+
+    rows = []
+    for day, route in enumerate(routes, start=1):
+        for stop, node in enumerate(route[1:-1], start=1):
+            rows.append((day, stop, place_names[node - 1], scores[node - 1], distances[node - 1]))
+    return pd.DataFrame(rows, columns=['Day', 'Stop', 'Place_Name', 'Score', 'Distance_km'])
+
+
+# Greedy + 2-opt against exhaustive search on each city's top places, plus latency on large inputs
+def benchmark_itinerary(data, score_lookup, max_places=8, days=2, large_sizes=(100, 300, 500)):
+    rows = []
+    for city, places in data.groupby('City_Name'):
+        places = places.drop_duplicates(subset=['Place_Name'])
+        scores = score_lookup(city, places['Place_Name']).to_numpy(dtype=np.float64)
+        top = np.argsort(-scores)[:max_places]
+        scores = scores[top]
+        distances = fill_missing_distances(parse_distance_km(places['Distance'].iloc[top]))
+        travel = travel_matrix(distances)
+
+        start = time.perf_counter()
+        greedy = routes_score(greedy_routes(scores, travel, days), scores)
+        greedy_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        exact = routes_score(exhaustive_routes(scores, travel, days), scores)
+        exact_ms = (time.perf_counter() - start) * 1000
+        rows.append({'city': city, 'places': len(scores), 'greedy_score': greedy, 'exact_score': exact,
+                     'ratio': greedy / exact if exact else 1.0, 'greedy_ms': greedy_ms, 'exact_ms': exact_ms})
+    small = pd.DataFrame(rows)
+
+    rng = np.random.default_rng(0)
+    large = []
+    for size in large_sizes:
+        scores, distances = rng.random(size), rng.gamma(2.0, 8.0, size)
+        start = time.perf_counter()
+        greedy_routes(scores, travel_matrix(distances), days=5)
+        large.append({'places': size, 'days': 5, 'greedy_ms': (time.perf_counter() - start) * 1000})
+    return small, pd.DataFrame(large)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the itinerary heuristic against exhaustive search')
+    parser.add_argument('--max-places', type=int, default=8)
+    parser.add_argument('--days', type=int, default=2)
+    args = parser.parse_args()
+
+    from recommender import active_model, city_place_scores
+    small, large = benchmark_itinerary(active_model().data, city_place_scores, max_places=args.max_places, days=args.days)
+    print(small.to_string(index=False))
+    print(small[['ratio', 'greedy_ms', 'exact_ms']].describe().to_string())
+    print(large.to_string(index=False))
@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import numpy as np
+
+import auth
+
+# Every simulated user logs in with this password, seeded into a copy of the user file for the run.
+# Set RECOMMENDER_SCRYPT_N for the run (inherited by http mode's servers) to change the hashing cost.
+LOADTEST_PASSWORD = 'loadtest-password'
+
+
+# Resident and peak memory of the current process in MB (current RSS needs /proc, i.e. Linux)
+def process_memory_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    try:
+        with open('/proc/self/statm') as statm:
+            current = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        current = float('nan')
+    return {'pid': os.getpid(), 'rss_mb': round(current, 1), 'peak_rss_mb': round(peak, 1)}
+
+
+# Copy of the user file where every account has LOADTEST_PASSWORD, hashed at the current scrypt cost
+def seed_credentials(target_path, source_path='User.csv', password=LOADTEST_PASSWORD):
+    import pandas as pd
+    users = pd.read_csv(source_path)
+    users['Password_Hash'] = auth.hash_password(password)
+    users.to_csv(target_path, index=False)
+    return target_path
+
+
+# The same steps app.py -> login_page() -> recommender_page() run for one user
+class Engine:
+    def __init__(self, users_path):
+        import login
+        import recommender
+        self.login = login
+        self.recommender = recommender
+        self.users_path = users_path
+        self.steps = {'login': self.do_login, 'places': self.places, 'hotels': self.hotels, 'logout': self.logout}
+
+    # Password check (one scrypt verify) and token issue, as in login_page()
+    def do_login(self, email, password):
+        user = self.login.authenticate(self.login.load_users(self.users_path), email, password, self.users_path)
+        if user is None:
+            return None
+        return auth.issue_token(user['User_ID'])
+
+    def user_id(self, token):
+        user_id = auth.validate_token(token)
+        if user_id is None:
+            raise PermissionError('invalid session token')
+        return int(user_id)
+
+    def places(self, token, city, category):
+        user_id = self.user_id(token)
+        # Same arguments as recommender.main(), so the MMR and review stages are measured too
+        places = self.recommender.recommend_places_by_city(city, category, user_rating=5, user_id=user_id,
+                                                           diversity=self.recommender.DIVERSITY_WEIGHT,
+                                                           review_weight=self.recommender.REVIEW_WEIGHT)
+        return 0 if places is None else len(places)
+
+    def hotels(self, token, city):
+        self.user_id(token)
+        return len(self.recommender.recommend_hotels(city))
+
+    def logout(self, token):
+        auth.revoke_token(token)
+
+
+# Drives the engine in-process: each step runs on a worker thread like a Streamlit script run
+class DirectClient:
+    def __init__(self, engine, threads):
+        self.engine = engine
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='session')
+
+    async def call(self, step, **params):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, lambda: self.engine.steps[step](**params))
+
+    async def memory(self):
+        return [process_memory_mb()]
+
+    def close(self):
+        self.pool.shutdown()
+
+
+# Local HTTP stand-in for the Streamlit server: GET /<step>?params -> JSON
+def make_handler(engine):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            step = url.path.strip('/')
+            try:
+                if step == 'memory':
+                    body = process_memory_mb()
+                else:
+                    body = {'result': engine.steps[step](**params)}
+                status = 200
+            except Exception as error:
+                body, status = {'error': repr(error)}, 500
+            payload = json.dumps(body, default=str).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(port, users_path):
+    ThreadingHTTPServer(('127.0.0.1', port), make_handler(Engine(users_path))).serve_forever()
+
+
+# Minimal asyncio HTTP/1.1 client (one request per connection) so no extra dependency is needed
+class HttpClient:
+    def __init__(self, ports):
+        self.ports = ports
+
+    async def get(self, port, path, **params):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        query = f'/{path}?{urlencode(params)}'
+        writer.write(f'GET {query} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        if not head.startswith(b'HTTP/1.1 200'):
+            raise RuntimeError(body.decode(errors='replace'))
+        return json.loads(body)
+
+    async def call(self, step, session_port, **params):
+        return (await self.get(session_port, step, **params)).get('result')
+
+    async def memory(self):
+        return [await self.get(port, 'memory') for port in self.ports]
+
+    def close(self):
+        pass
+
+
+def start_servers(workers, base_port, users_path):
+    processes = []
+    for port in range(base_port, base_port + workers):
+        processes.append(subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', '--port', str(port),
+                                           '--users', users_path]))
+    return processes
+
+
+async def wait_for_servers(client, timeout=300):
+    deadline = time.monotonic() + timeout
+    for port in client.ports:
+        while True:
+            try:
+                await client.get(port, 'memory')
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.5)
+
+
+# One simulated session: login, pick a city and category, places, hotels, logout
+async def run_session(client, emails, cities, categories, latencies, errors, rng, port=None):
+    extra = {} if port is None else {'session_port': port}
+
+    async def timed(step, **params):
+        start = time.perf_counter()
+        try:
+            return await client.call(step, **extra, **params)
+        except Exception:
+            errors[step] = errors.get(step, 0) + 1
+            return None
+        finally:
+            latencies.setdefault(step, []).append(time.perf_counter() - start)
+
+    session_start = time.perf_counter()
+    token = await timed('login', email=rng.choice(emails), password=LOADTEST_PASSWORD)
+    if token is None:
+        return
+    city = rng.choice(cities)
+    await timed('places', token=token, city=city, category=rng.choice(categories))
+    await timed('hotels', token=token, city=city)
+    await timed('logout', token=token)
+    latencies.setdefault('session', []).append(time.perf_counter() - session_start)
+
+
+async def run_load(client, sessions, concurrency, emails, cities, categories, seed=0, ports=None):
+    rng = random.Random(seed)
+    latencies, errors = {}, {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        async with semaphore:
+            port = ports[index % len(ports)] if ports else None
+            await run_session(client, emails, cities, categories, latencies, errors, rng, port)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(sessions)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, errors, sessions, elapsed, await client.memory())
+
+
+def summarize(latencies, errors, sessions, elapsed, memory):
+    steps = {}
+    for step, values in latencies.items():
+        values = np.asarray(values) * 1000
+        steps[step] = {
+            'count': len(values),
+            'errors': errors.get(step, 0),
+            'p50_ms': round(float(np.percentile(values, 50)), 2),
+            'p90_ms': round(float(np.percentile(values, 90)), 2),
+            'p99_ms': round(float(np.percentile(values, 99)), 2),
+            'max_ms': round(float(values.max()), 2),
+        }
+    return {
+        'sessions': sessions,
+        'elapsed_s': round(elapsed, 3),
+        'sessions_per_s': round(sessions / elapsed, 2) if elapsed else 0.0,
+        'steps': steps,
+        'memory': memory,
+    }
+
+
+def workload(users_path):
+    import pandas as pd
+    from login import load_users
+    data = pd.read_csv('Final Dataset.csv', usecols=['City_Name', 'Category'])
+    emails = load_users(users_path)['Email_Id'].dropna().tolist()
+    cities = data['City_Name'].dropna().unique().tolist()
+    categories = ['Select a category'] + data['Category'].dropna().unique().tolist()
+    return emails, cities, categories
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate concurrent recommender sessions')
+    parser.add_argument('mode', choices=['direct', 'http', 'serve'])
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=1, help='server processes in http mode')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--users', help='seeded user file (set by http mode for its servers)')
+    args = parser.parse_args()
+
+    if args.mode == 'serve':
+        serve(args.port, args.users)
+        return
+
+    users_path = seed_credentials(os.path.join(tempfile.mkdtemp(prefix='loadtest-'), 'User.csv'))
+    emails, cities, categories = workload(users_path)
+    if args.mode == 'direct':
+        client = DirectClient(Engine(users_path), threads=args.concurrency)
+        report = asyncio.run(run_load(client, args.sessions, args.concurrency, emails, cities, categories))
+    else:
+        processes = start_servers(args.workers, args.port, users_path)
+        client = HttpClient(list(range(args.port, args.port + args.workers)))
+        try:
+            asyncio.run(wait_for_servers(client))
+            report = asyncio.run(run_load(client, args.sessions, args.concurrency, emails, cities, categories,
+                                          ports=client.ports))
+        finally:
+            for process in processes:
+                process.terminate()
+    client.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
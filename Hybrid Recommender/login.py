@@ -1,25 +1,110 @@
 import streamlit as st
 import pandas as pd
+import argparse
 import os
+import secrets
+import time
+from auth import hash_password, issue_token, needs_rehash, verify_password
 
 # File path for users data
 USER_FILE_PATH = 'User.csv'
+USER_COLUMNS = ['User_ID', 'User_Name', 'Email_Id', 'Age', 'Sex', 'Places_Visited', 'Ratings_Given', 'Password_Hash',
+                'Reset_Hash', 'Reset_Expires']
+
+# One-time reset codes (how accounts without a password get one) stay valid this long
+RESET_CODE_TTL_SECONDS = 24 * 60 * 60
+
+# Parsed user files by path, reused across reruns until the file changes on disk.
+# Callers share the cached frame, so copy it before modifying.
+_users_cache = {}
 
 # Load user data with fallback
-def load_users():
-    if os.path.exists(USER_FILE_PATH):
+def load_users(path=USER_FILE_PATH):
+    if os.path.exists(path):
+        mtime = os.path.getmtime(path)
+        cached = _users_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         try:
-            return pd.read_csv(USER_FILE_PATH)
+            users = pd.read_csv(path)
         except Exception as e:
             st.error("Error loading user data: " + str(e))
-            return pd.DataFrame(columns=['User_ID', 'User_Name', 'Email_Id', 'Age', 'Sex', 'Places_Visited', 'Ratings_Given'])
+            return pd.DataFrame(columns=USER_COLUMNS)
+        _users_cache[path] = (mtime, users)
+        return users
     else:
         # Return an empty DataFrame if the file does not exist
-        return pd.DataFrame(columns=['User_ID', 'User_Name', 'Email_Id', 'Age', 'Sex', 'Places_Visited', 'Ratings_Given'])
+        return pd.DataFrame(columns=USER_COLUMNS)
 
 # Save user data back to CSV
-def save_users(users):
-    users.to_csv(USER_FILE_PATH, index=False)
+def save_users(users, path=USER_FILE_PATH):
+    users.to_csv(path, index=False)
+    _users_cache.pop(path, None)
+
+# Update one user's row and save it back to the file it was loaded from (the cached frame is copied,
+# never modified in place)
+def update_user(users, user_id, path=USER_FILE_PATH, **fields):
+    users = users.copy()
+    for column, value in fields.items():
+        users[column] = users[column].astype(object) if column in users else None
+        users.loc[users['User_ID'] == user_id, column] = value
+    save_users(users, path)
+    return users
+
+# Store a fresh password hash for one user
+def set_password_hash(users, user_id, password, path=USER_FILE_PATH):
+    return update_user(users, user_id, path, Password_Hash=hash_password(password))
+
+def _stored(user_info, column):
+    value = user_info.get(column)
+    return None if value is None or pd.isna(value) or value == '' else value
+
+# True once the user has set a password; older accounts have none until they use a reset code
+def has_password(user_info):
+    return _stored(user_info, 'Password_Hash') is not None
+
+# Check a login. Accounts without a password are refused: they must set one with a reset code.
+def authenticate(users, email, password, path=USER_FILE_PATH):
+    user_info = find_user_by_email(users, email)
+    if user_info is None or not password or not has_password(user_info):
+        return None
+    stored = user_info['Password_Hash']
+    if not verify_password(password, stored):
+        return None
+    if needs_rehash(stored):
+        set_password_hash(users, user_info['User_ID'], password, path)
+    return user_info
+
+# Create a one-time reset code for an account (run by an administrator, who passes it on to the user
+# out of band). Only its hash is stored; issuing a new code replaces any earlier one.
+def issue_reset_code(users, email, ttl=RESET_CODE_TTL_SECONDS, path=USER_FILE_PATH):
+    user_info = find_user_by_email(users, email)
+    if user_info is None:
+        return None
+    code = secrets.token_urlsafe(12)
+    update_user(users, user_info['User_ID'], path, Reset_Hash=hash_password(code), Reset_Expires=int(time.time()) + ttl)
+    return code
+
+# Set a new password with a valid reset code; the code is used up either way once it matches
+def complete_password_reset(users, email, code, new_password, path=USER_FILE_PATH):
+    user_info = find_user_by_email(users, email)
+    if user_info is None or not code or not new_password:
+        return False
+    stored, expires = _stored(user_info, 'Reset_Hash'), _stored(user_info, 'Reset_Expires')
+    if stored is None or expires is None or float(expires) <= time.time():
+        return False
+    if not verify_password(code, stored):
+        return False
+    update_user(users, user_info['User_ID'], path, Password_Hash=hash_password(new_password), Reset_Hash=None,
+                Reset_Expires=None)
+    return True
+
+# Look up a user by email (case-insensitive); returns None when not registered
+def find_user_by_email(users, email):
+    if users.empty or not email:
+        return None
+    matches = users[users['Email_Id'].str.lower() == email.lower()]
+    return None if matches.empty else matches.iloc[0]
 
 # Apply the theme to the page
 st.markdown(
@@ -112,24 +197,33 @@ def login_page():
     users = load_users()
 
     # Sidebar for login or registration
-    option = st.radio("Choose an option", ["Login", "Register"], index=0)
+    option = st.radio("Choose an option", ["Login", "Register", "Reset Password"], index=0)
 
     if option == "Login":
         st.subheader("Login")
         email = st.text_input("Enter your Email:")
+        password = st.text_input("Enter your Password:", type="password")
         if st.button("Login"):
-            if not users.empty and email.lower() in users['Email_Id'].str.lower().values:
-                user_info = users[users['Email_Id'].str.lower() == email.lower()]
-                st.success(f"Welcome, {user_info['User_Name'].values[0]}!")
-                st.session_state['user_id'] = user_info['User_ID'].values[0]
-                st.experimental_rerun()  # Navigate to recommender after login
-            else:
+            if find_user_by_email(users, email) is None:
                 st.error("User not found. Please register.")
+            elif not has_password(find_user_by_email(users, email)):
+                st.error("This account has no password yet. Ask an administrator for a reset code, "
+                         "then choose Reset Password.")
+            else:
+                user_info = authenticate(users, email, password)
+                if user_info is not None:
+                    st.success(f"Welcome, {user_info['User_Name']}!")
+                    st.session_state['user_id'] = user_info['User_ID']
+                    st.session_state['session_token'] = issue_token(user_info['User_ID'])
+                    st.experimental_rerun()  # Navigate to recommender after login
+                else:
+                    st.error("Incorrect password.")
     
     elif option == "Register":
         st.subheader("Register")
         name = st.text_input("Enter your Name:")
         email = st.text_input("Enter your Email:")
+        password = st.text_input("Choose a Password:", type="password")
         age = st.number_input("Enter your Age:", min_value=1, max_value=100, value=25)
         sex = st.selectbox("Select your Gender:", options=["Male", "Female", "Other"])
         places_visited = st.text_area(
@@ -150,17 +244,39 @@ def login_page():
             ratings_given = None  # or you can set this to an empty value or any other default behavior
 
         if st.button("Submit Registration"):
-            if name and email and sex:
+            if name and email and sex and password:
                 if not users.empty and email.lower() in users['Email_Id'].str.lower().values:
                     st.warning("Email already exists. Please log in.")
                 else:
                     new_user_id = users['User_ID'].max() + 1 if not users.empty else 1
                     new_user = pd.DataFrame([[
-                        new_user_id, name, email, age, sex, places_visited, ratings_given
-                    ]], columns=['User_ID', 'User_Name', 'Email_Id', 'Age', 'Sex', 'Places_Visited', 'Ratings_Given'])
+                        new_user_id, name, email, age, sex, places_visited, ratings_given, hash_password(password),
+                        None, None
+                    ]], columns=USER_COLUMNS)
                     
                     users = pd.concat([users, new_user], ignore_index=True)
                     save_users(users)  # Save updated users
                     st.success(f"Registration successful! Your User ID is {new_user_id}.")
             else:
                 st.error("Please fill all required fields to register.")
+
+    elif option == "Reset Password":
+        st.subheader("Reset Password")
+        email = st.text_input("Enter your Email:")
+        code = st.text_input("Enter your Reset Code:", type="password")
+        password = st.text_input("Choose a New Password:", type="password")
+        if st.button("Set Password"):
+            if complete_password_reset(users, email, code, password):
+                st.success("Password set. Please log in.")
+            else:
+                st.error("Invalid or expired reset code.")
+
+
+# Administrator entry point: python login.py --reset-code <email>
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Issue a one-time password reset code')
+    parser.add_argument('--reset-code', metavar='EMAIL', required=True)
+    args = parser.parse_args()
+
+    reset_code = issue_reset_code(load_users(), args.reset_code)
+    print(reset_code if reset_code else f'No user registered with {args.reset_code}')
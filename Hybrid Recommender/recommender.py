@@ -4,60 +4,214 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import MinMaxScaler
 import numpy as np
+import os
+import threading
+from collections import Counter, OrderedDict
+from scipy.sparse import csr_matrix
+from factorization import fit_als, fold_in_user, normalize_factors, score_user, similar_items
+from cold_start import build_place_positions, build_profile, get_profile, parse_visits, score_profile, update_profile
+from warmup import WarmupScheduler, warmup_targets
+from itinerary import load_ideal_durations, parse_distance_km, plan_itinerary
+from diversity import mmr_rerank
+from registry import ModelRegistry
+from auth import revoke_token, validate_token
+from login import load_users
+from catalog import DESTINATIONS_FILE_PATH, REVIEWS_FILE_PATH
+from reviews import load_review_features, review_signal_for_places
 
-# Load the datasets
-data = pd.read_csv('Final Dataset.csv')
-hotels = pd.read_csv('Hotels.csv')
-users = pd.read_csv('User.csv')
-
-# Data Cleaning
-data.drop_duplicates(subset=['City_Name', 'Place_Name'], inplace=True)
-data.fillna({'Place_desc': '', 'Category': '', 'Best_time_to_visit': ''}, inplace=True)
-hotels.fillna({'hotel_description': '', 'property_type': ''}, inplace=True)
-
-# Feature Engineering for Places
-places_content = data[['Place_Name', 'Place_desc', 'Category', 'Best_time_to_visit']].drop_duplicates()
-places_content['combined_features'] = (
-    places_content['Place_desc'] + ' ' + places_content['Category']
-)
-
-# Ensure unique Place_Name
-places_content.drop_duplicates(subset=['Place_Name'], inplace=True)
-
-# TF-IDF Vectorization
-vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
-tfidf_matrix = vectorizer.fit_transform(places_content['combined_features'])
-
-# Cosine Similarity
-content_similarity = cosine_similarity(tfidf_matrix)
-content_similarity_df = pd.DataFrame(
-    content_similarity, index=places_content['Place_Name'], columns=places_content['Place_Name']
-)
-
-# Ensure unique indices and columns for content_similarity_df
-content_similarity_df = content_similarity_df.loc[~content_similarity_df.index.duplicated()]
-content_similarity_df = content_similarity_df.loc[:, ~content_similarity_df.columns.duplicated()]
-
-# Collaborative Filtering
-rating_matrix = data.pivot_table(index='User_Id', columns='Place_Name', values='User_Rating').fillna(0)
-rating_matrix = rating_matrix.loc[~rating_matrix.index.duplicated(), ~rating_matrix.columns.duplicated()]
-normalized_ratings = rating_matrix.apply(lambda x: (x - x.mean()) / (x.std() + 1e-9), axis=1)
-collab_similarity = cosine_similarity(normalized_ratings.T)
-collab_similarity_df = pd.DataFrame(
-    collab_similarity, index=rating_matrix.columns, columns=rating_matrix.columns
-)
-
-# Ensure unique indices and columns for collab_similarity_df
-collab_similarity_df = collab_similarity_df.loc[~collab_similarity_df.index.duplicated()]
-collab_similarity_df = collab_similarity_df.loc[:, ~collab_similarity_df.columns.duplicated()]
+# Default Collaborative Filtering backend (per snapshot: reload_models(collab_backend='als')):
+# 'item' keeps a full place x place cosine matrix, 'als' keeps only user and place factors
+COLLAB_BACKEND = 'item'
+
+# Define age-based category mappings
+teen_categories = {'Beaches', 'Valleys', 'Waterbodies', 'Trekking', 'Adventurous Trips'}
+senior_categories = {'Temples', 'Hospitals', 'Forts', 'Tunnels'}
+
+
+# Build every model the app serves from one set of source files (one registry snapshot)
+def build_models(dataset_path='Final Dataset.csv', hotels_path='Hotels.csv', users_path='User.csv',
+                 destinations_path=DESTINATIONS_FILE_PATH, reviews_path=REVIEWS_FILE_PATH,
+                 collab_backend=COLLAB_BACKEND):
+    if collab_backend not in ('item', 'als'):
+        raise ValueError(f"Unknown collab_backend '{collab_backend}', expected 'item' or 'als'")
+    mtimes = source_mtimes(dataset_path, hotels_path, destinations_path, reviews_path)
+
+    # Load the datasets
+    data = pd.read_csv(dataset_path)
+    hotels = pd.read_csv(hotels_path)
+    users = pd.read_csv(users_path)
+
+    # Data Cleaning
+    data.drop_duplicates(subset=['City_Name', 'Place_Name'], inplace=True)
+    data.fillna({'Place_desc': '', 'Category': '', 'Best_time_to_visit': ''}, inplace=True)
+    hotels.fillna({'hotel_description': '', 'property_type': ''}, inplace=True)
+
+    # Feature Engineering for Places
+    places_content = data[['Place_Name', 'Place_desc', 'Category', 'Best_time_to_visit']].drop_duplicates()
+    places_content['combined_features'] = (
+        places_content['Place_desc'] + ' ' + places_content['Category']
+    )
+
+    # Ensure unique Place_Name
+    places_content.drop_duplicates(subset=['Place_Name'], inplace=True)
+
+    # TF-IDF Vectorization
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+    tfidf_matrix = vectorizer.fit_transform(places_content['combined_features'])
+
+    # Cosine Similarity
+    content_similarity = cosine_similarity(tfidf_matrix)
+    content_similarity_df = pd.DataFrame(
+        content_similarity, index=places_content['Place_Name'], columns=places_content['Place_Name']
+    )
+
+    # Ensure unique indices and columns for content_similarity_df
+    content_similarity_df = content_similarity_df.loc[~content_similarity_df.index.duplicated()]
+    content_similarity_df = content_similarity_df.loc[:, ~content_similarity_df.columns.duplicated()]
+
+    # Collaborative Filtering
+    rating_matrix = data.pivot_table(index='User_Id', columns='Place_Name', values='User_Rating').fillna(0)
+    rating_matrix = rating_matrix.loc[~rating_matrix.index.duplicated(), ~rating_matrix.columns.duplicated()]
+
+    collab_similarity_df = None
+    user_factors = place_factors = normalized_place_factors = None
+    if collab_backend == 'als':
+        user_factors, place_factors = fit_als(csr_matrix(rating_matrix.values))
+        normalized_place_factors = normalize_factors(place_factors)
+        collab_places = pd.Index(rating_matrix.columns)
+    else:
+        normalized_ratings = rating_matrix.apply(lambda x: (x - x.mean()) / (x.std() + 1e-9), axis=1)
+        collab_similarity = cosine_similarity(normalized_ratings.T)
+        collab_similarity_df = pd.DataFrame(
+            collab_similarity, index=rating_matrix.columns, columns=rating_matrix.columns
+        )
+
+        # Ensure unique indices and columns for collab_similarity_df
+        collab_similarity_df = collab_similarity_df.loc[~collab_similarity_df.index.duplicated()]
+        collab_similarity_df = collab_similarity_df.loc[:, ~collab_similarity_df.columns.duplicated()]
+        collab_places = collab_similarity_df.index
+
+    # Review sentiment signal from the collaborative dataset (zero when its files are not available)
+    review_signal = pd.Series(0.0, index=content_similarity_df.index)
+    if os.path.exists(destinations_path) and os.path.exists(reviews_path):
+        review_features = load_review_features(destinations_path, reviews_path)
+        review_signal = review_signal_for_places(review_features, data).reindex(review_signal.index).fillna(0)
+
+    return {
+        'data': data,
+        'hotels': hotels,
+        'users': users,
+        'users_path': users_path,
+        'places_content': places_content,
+        'tfidf_matrix': tfidf_matrix,
+        'content_similarity_df': content_similarity_df,
+        'rating_matrix': rating_matrix,
+        'collab_backend': collab_backend,
+        'collab_similarity_df': collab_similarity_df,
+        'normalized_place_factors': normalized_place_factors,
+        'collab_places': collab_places,
+        # ALS only: rows of user_factors follow rating_matrix.index, rows of place_factors collab_places
+        'user_factors': user_factors,
+        'place_factors': place_factors,
+        'collab_place_positions': build_place_positions(collab_places),
+        'review_signal': review_signal,
+        # Cold-start profiles: rows of tfidf_matrix follow the order of places_content
+        'place_positions': build_place_positions(places_content['Place_Name']),
+        # Cache of the user-independent city scores, keyed on (city, category, alpha, review_weight)
+        'city_scores_cache': OrderedDict(),
+        # Build arguments and source file times, so reload_if_changed() can rebuild the same way
+        'sources': {'dataset_path': dataset_path, 'hotels_path': hotels_path, 'users_path': users_path,
+                    'destinations_path': destinations_path, 'reviews_path': reviews_path,
+                    'collab_backend': collab_backend},
+        'source_mtimes': mtimes,
+    }
+
+
+# Modification time of each source file (None when it does not exist)
+def source_mtimes(*paths):
+    return {path: os.path.getmtime(path) if os.path.exists(path) else None for path in paths}
+
+
+# Live traffic counters, shared by every model version
+MAX_CACHED_CITY_SCORES = 512
+request_counts = Counter()
+active_requests = 0
+_cache_lock = threading.Lock()
+warmup_scheduler = None
+
+
+# Precompute the most requested cities and categories in the background after each (re)load.
+# pause() is called before every place and blocks while live requests are running.
+def warm_city(model, city_name, selected_category, pause=None):
+    _recommend_places_by_city(city_name, selected_category, user_rating=5, model=model, review_weight=REVIEW_WEIGHT,
+                              pause=pause)
+
+
+def start_warmup(model=None, time_budget=20.0, max_workers=1):
+    global warmup_scheduler
+    model = model or active_model()
+    with _cache_lock:
+        counts = dict(request_counts)
+    if warmup_scheduler is not None:
+        warmup_scheduler.stop()
+    targets = [(model, city, category) for city, category in warmup_targets(model.data, counts)]
+    warmup_scheduler = WarmupScheduler(warm_city, targets, time_budget=time_budget, max_workers=max_workers,
+                                       should_yield=lambda: active_requests > 0).start()
+    return warmup_scheduler
+
+
+# Model registry: the app serves DEFAULT_MODEL; call reload_models() to rebuild it without downtime
+DEFAULT_MODEL = 'default'
+registry = ModelRegistry(build_models, on_swap=start_warmup)
+
+
+def active_model(name=DEFAULT_MODEL):
+    return registry.get(name)
+
+
+def reload_models(name=DEFAULT_MODEL, **sources):
+    return registry.load_async(name, **sources)
+
+
+def model_status():
+    return registry.status()
+
+
+# Rebuild in the background when a source dataset changed on disk. User.csv is not watched: new
+# registrations are read live through login.load_users().
+_reload_attempts = {}
+
+
+def reload_if_changed(name=DEFAULT_MODEL):
+    model = active_model(name)
+    mtimes = source_mtimes(*model.source_mtimes)
+    if mtimes == model.source_mtimes or mtimes == _reload_attempts.get(name):
+        return None
+    _reload_attempts[name] = mtimes
+    return reload_models(name, **model.sources)
+
+
+# Users allowed to see the model status and trigger a reload (comma-separated User_IDs)
+ADMIN_USER_IDS = {user_id.strip() for user_id in os.environ.get('RECOMMENDER_ADMIN_IDS', '').split(',')
+                  if user_id.strip()}
+
+
+# Collaborative scores of every place against one place, from whichever backend built the model
+def collab_scores_for(place_name, model):
+    if model.collab_backend == 'als':
+        scores = similar_items(model.normalized_place_factors, model.collab_places.get_loc(place_name))
+        return pd.Series(scores, index=model.collab_places)
+    return model.collab_similarity_df[place_name]
 
 # Hybrid Recommendation Function
-def hybrid_recommendation(place_name, user_rating, alpha=0.5):
-    if place_name not in content_similarity_df.index or place_name not in collab_similarity_df.index:
+def hybrid_recommendation(place_name, user_rating, alpha=0.5, model=None, review_weight=0.0):
+    model = model or active_model()
+    content_similarity_df = model.content_similarity_df
+    if place_name not in content_similarity_df.index or place_name not in model.collab_places:
         return None
     
     content_scores = content_similarity_df[place_name]
-    collab_scores = collab_similarity_df[place_name]
+    collab_scores = collab_scores_for(place_name, model)
     
     # Align indices
     aligned_index = content_scores.index.intersection(collab_scores.index)
@@ -65,14 +219,149 @@ def hybrid_recommendation(place_name, user_rating, alpha=0.5):
     collab_scores = collab_scores.loc[aligned_index]
 
     hybrid_scores = alpha * content_scores + (1 - alpha) * collab_scores
+    
+    # Optional review sentiment term
+    if review_weight:
+        hybrid_scores = hybrid_scores + review_weight * model.review_signal.reindex(aligned_index).fillna(0)
     return hybrid_scores.sort_values(ascending=False)
 
-# Define age-based category mappings
-teen_categories = {'Beaches', 'Valleys', 'Waterbodies', 'Trekking', 'Adventurous Trips'}
-senior_categories = {'Temples', 'Hospitals', 'Forts', 'Tunnels'}
+
+# Registration row for a user; the user file is only re-read when it changes, so users registered
+# after startup are found without reading it on every request
+def registered_user(user_id, model=None):
+    model = model or active_model()
+    registered = load_users(model.users_path)
+    user_row = registered.loc[registered['User_ID'] == user_id]
+    return None if user_row.empty else user_row.iloc[0]
+
+
+# Cold-start profiles are cached per model version, since they live in that version's TF-IDF space
+def cold_start_profile(user_id, model=None):
+    model = model or active_model()
+
+    def build():
+        user_row = registered_user(user_id, model)
+        if user_row is None:
+            return None
+        return build_profile(user_row, model.tfidf_matrix, model.place_positions,
+                             model.places_content['Category'], teen_categories, senior_categories)
+    return get_profile((model.name, model.version, user_id), build)
 
 
-def recommend_places_by_city(city_name, selected_category, user_rating, alpha=0.5, user_id=None):
+# Record a new rating for a user, keeping their cached cold-start profile current.
+# The app has no per-place rating UI yet, so nothing calls this; a rating form should call it
+# after saving the rating.
+def record_rating(user_id, place_name, rating, model=None):
+    model = model or active_model()
+    position = model.place_positions.get(str(place_name).strip().casefold())
+    if position is not None:
+        update_profile((model.name, model.version, user_id), position, rating, model.tfidf_matrix)
+
+
+def recommend_from_profile(profile, candidate_places, top_n=10, diversity=0.0, model=None):
+    model = model or active_model()
+    place_names = model.places_content['Place_Name']
+    scores = pd.Series(score_profile(profile, model.tfidf_matrix), index=place_names.values)
+    seen = place_names.iloc[sorted(profile['seen'])]
+    scores = scores[scores.index.isin(candidate_places) & ~scores.index.isin(seen)]
+    return mmr_rerank(scores, model.tfidf_matrix, model.place_positions, diversity, top_n=top_n)
+
+
+# ALS scores of every place for one user: a single user-factor x place-factor product. Users who
+# are not in the trained matrix but rated visited places at registration are folded in from those
+# per-place ratings. Returns (scores, rated place names), or None for the item backend and unrated users.
+def user_factor_scores(user_id, model=None):
+    model = model or active_model()
+    if model.collab_backend != 'als' or user_id is None:
+        return None
+
+    if user_id in model.rating_matrix.index:
+        user_vector = model.user_factors[model.rating_matrix.index.get_loc(user_id)]
+        user_ratings = model.rating_matrix.loc[user_id]
+        rated = user_ratings[user_ratings > 0].index
+    else:
+        user_row = registered_user(user_id, model)
+        if user_row is None:
+            return None
+        ratings = {}
+        for name, rating in parse_visits(user_row.get('Places_Visited'), user_row.get('Ratings_Given')):
+            position = model.collab_place_positions.get(name.casefold())
+            if position is not None and rating is not None:
+                ratings[position] = rating
+        if not ratings:
+            return None
+        positions = sorted(ratings)
+        user_vector = fold_in_user(model.place_factors, positions, [ratings[position] for position in positions])
+        rated = model.collab_places[positions]
+
+    return pd.Series(score_user(model.place_factors, user_vector), index=model.collab_places), rated
+
+
+# Blend the user's ALS scores into the city's hybrid scores, both limited to the candidate places
+# and min-max scaled over them
+def blend_user_scores(recommendations, user_scores, candidate_places, alpha=0.5):
+    recommendations = recommendations[recommendations.index.isin(candidate_places)]
+    if recommendations.empty:
+        return recommendations
+    user_scores = user_scores.reindex(recommendations.index)
+    user_scores = user_scores.fillna(user_scores.min() if user_scores.notna().any() else 0)
+    scaled = [(values - values.min()) / (values.max() - values.min()) if values.max() > values.min()
+              else values * 0 for values in (recommendations, user_scores)]
+    return alpha * scaled[0] + (1 - alpha) * scaled[1]
+
+
+# Weight of the diversity term in the MMR re-ranking of the final top 10 (0 keeps the score order)
+DIVERSITY_WEIGHT = 0.3
+
+# Weight of the review sentiment term in the hybrid score (0 leaves it out)
+REVIEW_WEIGHT = 0.0
+
+
+def city_hybrid_scores(city_name, selected_category, relevant_places, alpha=0.5, model=None, review_weight=0.0,
+                       pause=None):
+    model = model or active_model()
+    cache = model.city_scores_cache
+    key = (city_name.lower(), selected_category, alpha, review_weight)
+    with _cache_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    recommendations = pd.Series(dtype='float32')
+    for place in relevant_places:
+        if pause:
+            pause()
+        scores = hybrid_recommendation(place, None, alpha, model=model, review_weight=review_weight)
+        if scores is not None:
+            recommendations = recommendations.add(scores, fill_value=0)
+
+    with _cache_lock:
+        cache[key] = recommendations
+        while len(cache) > MAX_CACHED_CITY_SCORES:
+            cache.popitem(last=False)
+    return recommendations
+
+
+def recommend_places_by_city(city_name, selected_category, user_rating, alpha=0.5, user_id=None, diversity=0.0,
+                             model=None, review_weight=0.0):
+    global active_requests
+    model = model or active_model()
+    with _cache_lock:
+        request_counts[(city_name.lower(), selected_category)] += 1
+        active_requests += 1
+    try:
+        return _recommend_places_by_city(city_name, selected_category, user_rating, alpha, user_id, diversity, model,
+                                         review_weight)
+    finally:
+        with _cache_lock:
+            active_requests -= 1
+
+
+def _recommend_places_by_city(city_name, selected_category, user_rating, alpha=0.5, user_id=None, diversity=0.0,
+                              model=None, review_weight=0.0, pause=None):
+    model = model or active_model()
+    data, users, rating_matrix = model.data, model.users, model.rating_matrix
+
     # Fetch user's age if user_id is provided
     user_age = None
     if user_id is not None and user_id in users['User_ID'].values:
@@ -95,25 +384,38 @@ def recommend_places_by_city(city_name, selected_category, user_rating, alpha=0.
     if city_places.empty:
         city_places = data[data['City_Name'].str.lower() == city_name.lower()]
     
-    relevant_places = set(city_places['Place_Name']) & set(content_similarity_df.index)
+    relevant_places = set(city_places['Place_Name']) & set(model.content_similarity_df.index)
     
     # If no relevant places, recommend popular places across all cities
     if not relevant_places:
         fallback_places = data.nlargest(10, 'User_Rating')
         return fallback_places[['Place_Name', 'Category', 'User_Rating', 'Place_desc']].drop_duplicates()
     
-    recommendations = pd.Series(dtype='float32')
-    for place in relevant_places:
-        scores = hybrid_recommendation(place, user_rating, alpha)
-        if scores is not None:
-            recommendations = recommendations.add(scores, fill_value=0)
+    # ALS backend: personal scores from the user's factors (folded in for users rated since training)
+    personal = user_factor_scores(user_id, model)
+    
+    # New users without ratings are scored against their registration profile
+    if user_id is not None and user_id not in rating_matrix.index and personal is None:
+        profile = cold_start_profile(user_id, model)
+        if profile is not None:
+            recommendations = recommend_from_profile(profile, relevant_places, diversity=diversity, model=model)
+            if not recommendations.empty:
+                return recommendations
+    
+    recommendations = city_hybrid_scores(city_name, selected_category, relevant_places, alpha, model, review_weight,
+                                         pause)
     
     # Exclude places already rated by the user
-    if user_id is not None and user_id in rating_matrix.index:
+    if personal is not None:
+        user_scores, rated = personal
+        recommendations = blend_user_scores(recommendations[~recommendations.index.isin(rated)], user_scores,
+                                            relevant_places, alpha)
+    elif user_id is not None and user_id in rating_matrix.index:
         user_ratings = rating_matrix.loc[user_id]
         recommendations = recommendations[~recommendations.index.isin(user_ratings[user_ratings > 0].index)]
     
-    recommendations = recommendations.sort_values(ascending=False).head(10)
+    # Re-rank the top candidates for diversity (a plain top 10 when diversity is 0)
+    recommendations = mmr_rerank(recommendations, model.tfidf_matrix, model.place_positions, diversity, top_n=10)
     
     # Fallback to popular places if no personalized recommendations found
     if recommendations.empty:
@@ -123,8 +425,41 @@ def recommend_places_by_city(city_name, selected_category, user_rating, alpha=0.
     return recommendations
 
 
+# Hybrid scores of a city's own places, scaled to (0, 1] for the itinerary planner
+def city_place_scores(city_name, place_names, selected_category='Select a category', alpha=0.5, model=None):
+    model = model or active_model()
+    relevant_places = set(place_names) & set(model.content_similarity_df.index)
+    scores = city_hybrid_scores(city_name, selected_category, relevant_places, alpha, model)
+    scores = scores.reindex(place_names).fillna(0)
+    scaled = MinMaxScaler(feature_range=(0.01, 1)).fit_transform(scores.to_numpy().reshape(-1, 1)).ravel()
+    return pd.Series(scaled, index=place_names)
+
+
+# Itinerary Function: multi-day plan over the city's places, sized by Ideal_duration by default
+ideal_durations = load_ideal_durations()
+
+
+def recommend_itinerary(city_name, selected_category='Select a category', days=None, alpha=0.5, model=None,
+                        **budgets):
+    model = model or active_model()
+    data = model.data
+    city_places = data[data['City_Name'].str.lower() == city_name.lower()]
+    if selected_category and selected_category != 'Select a category':
+        city_places = city_places[city_places['Category'] == selected_category]
+    city_places = city_places.drop_duplicates(subset=['Place_Name'])
+    if city_places.empty:
+        return None
+
+    if days is None:
+        days = ideal_durations.get(city_name.strip().lower(), (2, 2))[1]
+    scores = city_place_scores(city_name, city_places['Place_Name'], selected_category, alpha, model)
+    return plan_itinerary(city_places['Place_Name'].tolist(), scores.to_numpy(),
+                          parse_distance_km(city_places['Distance']), days, **budgets)
+
+
 # Recommend Hotels Function
-def recommend_hotels(city, min_reviews=3):
+def recommend_hotels(city, min_reviews=3, model=None):
+    hotels = (model or active_model()).hotels
     filtered = hotels[hotels['city'].str.lower() == city.lower()]
     filtered = filtered[filtered['site_review_rating'] >= min_reviews]
     
@@ -141,6 +476,10 @@ def recommend_hotels(city, min_reviews=3):
     recommendations = filtered.sort_values(by='review_score', ascending=False).head(10)
     return recommendations
 
+
+# Build the default model once at startup (this also starts the warm-up)
+registry.load(DEFAULT_MODEL)
+
 # Streamlit App
 def main():
     st.markdown(
@@ -227,6 +566,10 @@ def main():
 
     st.title('Hybrid Tourism Recommendation System')
 
+    # Every widget and lookup in this run uses the same model version, even if a reload swaps it meanwhile
+    model = active_model()
+    data = model.data
+
     # User input for city and category
     city_name = st.selectbox('Select a city:', options=['Select a city'] + list(data['City_Name'].unique()))
     selected_category = st.selectbox('Select a category:', options=['Select a category'] + list(data['Category'].unique()))
@@ -237,7 +580,8 @@ def main():
     # Recommendation for places based on button click
     if st.button('Recommend Places'):
         if city_name != 'Select a city':
-            places = recommend_places_by_city(city_name, selected_category, user_rating=5, user_id=user_id)
+            places = recommend_places_by_city(city_name, selected_category, user_rating=5, user_id=user_id,
+                                              diversity=DIVERSITY_WEIGHT, model=model, review_weight=REVIEW_WEIGHT)
             if places is None or places.empty:
                 st.markdown('<p style="color:blue;">No recommendations available.</p>', unsafe_allow_html=True)
             else:
@@ -262,7 +606,7 @@ def main():
     # Recommendation for hotels based on button click
     if st.button('Recommend Hotels'):
         if city_name != 'Select a city':
-            recommended_hotels = recommend_hotels(city_name)
+            recommended_hotels = recommend_hotels(city_name, model=model)
             if recommended_hotels.empty:
                 st.markdown('<p style="color:blue;">No hotel recommendations available.</p>', unsafe_allow_html=True)
             else:
@@ -286,11 +630,31 @@ def main():
     if city_name == 'Select a city' or selected_category == 'Select a category':
         st.markdown('<p style="color:blue;">Please select a city and category to get recommendations.</p>', unsafe_allow_html=True)
 
+# Active model version for everyone; full status and a reload button for admins
+def model_sidebar():
+    info = active_model().info()
+    st.sidebar.caption(f"Model version {info['version']}, built {info['built_at']} in {info['build_seconds']} s")
+    if str(st.session_state.get('user_id')) in ADMIN_USER_IDS:
+        with st.sidebar.expander("Model status"):
+            st.json(model_status())
+            if st.button("Reload models", key="reload_models_button"):
+                reload_models(**active_model().sources)
+                st.success("Rebuilding in the background; the current version keeps serving.")
+
+
 def recommender_page():
-    # Check if user is logged in
+    # Check if user is logged in with a valid session token (answered from the in-process cache)
     if 'user_id' not in st.session_state:
         st.warning("Please log in first.")
         st.stop()
+    if validate_token(st.session_state.get('session_token')) != str(st.session_state['user_id']):
+        st.session_state.clear()
+        st.warning("Your session has expired. Please log in again.")
+        st.stop()
+
+    # Pick up changed datasets without a restart; the current version serves until the new one is ready
+    reload_if_changed()
+    model_sidebar()
 
     main()
     
@@ -302,5 +666,6 @@ def recommender_page():
     if st.button("Logout", key="logout_button"):
         # Action for the logout button
         # You can replace this with logic to actually log the user out
+        revoke_token(st.session_state.get('session_token'))
         st.session_state.clear()  # Clear session data (e.g., user_id)
         st.experimental_rerun()  # Refresh the page
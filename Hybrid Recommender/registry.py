@@ -0,0 +1,108 @@
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+
+
+# Read-only bundle of everything one model version needs to serve requests. Requests hold on to
+# the snapshot they started with, so a swap never changes the data under a running request.
+class ModelSnapshot:
+    def __init__(self, name, version, built_at, build_seconds, parts):
+        for key, value in dict(parts, name=name, version=version, built_at=built_at,
+                               build_seconds=build_seconds).items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('ModelSnapshot is read-only; build a new version instead')
+
+    def __delattr__(self, key):
+        raise AttributeError('ModelSnapshot is read-only; build a new version instead')
+
+    def info(self):
+        return {'name': self.name, 'version': self.version, 'built_at': self.built_at,
+                'build_seconds': round(self.build_seconds, 3)}
+
+
+# Named, versioned model snapshots (one per region or dataset) with atomic hot-swap.
+# builder(**sources) returns the dict of parts for a snapshot.
+class ModelRegistry:
+    def __init__(self, builder, on_swap=None):
+        self.builder = builder
+        self.on_swap = on_swap
+        self._active = {}
+        self._versions = {}
+        self._building = {}
+        self._errors = {}
+        self._retired = []
+        self._lock = threading.Lock()
+
+    def get(self, name='default'):
+        snapshot = self._active.get(name)
+        if snapshot is None:
+            raise KeyError(f"No model loaded under '{name}'")
+        return snapshot
+
+    def names(self):
+        return list(self._active)
+
+    # Build a new version and swap it in; the old version is freed once no request holds it
+    def load(self, name='default', **sources):
+        with self._lock:
+            version = self._versions.get(name, 0) + 1
+            self._versions[name] = version
+
+        start = time.perf_counter()
+        try:
+            parts = self.builder(**sources)
+        except Exception as error:
+            with self._lock:
+                self._errors[name] = repr(error)
+            raise
+        snapshot = ModelSnapshot(name, version, datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                                 time.perf_counter() - start, parts)
+
+        with self._lock:
+            current = self._active.get(name)
+            if current is not None and current.version > version:
+                return current
+            self._active[name] = snapshot
+            self._errors.pop(name, None)
+            if current is not None:
+                self._retired.append(weakref.ref(current))
+            self._retired = [ref for ref in self._retired if ref() is not None]
+        del current
+
+        if self.on_swap:
+            self.on_swap(snapshot)
+        return snapshot
+
+    # Build in a background thread; serving continues on the active version meanwhile
+    def load_async(self, name='default', **sources):
+        def build():
+            try:
+                self.load(name, **sources)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._building.pop(name, None)
+
+        with self._lock:
+            running = self._building.get(name)
+            if running is not None and running.is_alive():
+                return running
+            thread = threading.Thread(target=build, name=f'model-build-{name}', daemon=True)
+            self._building[name] = thread
+        thread.start()
+        return thread
+
+    # Active version and build timestamps per model, plus retired versions still held by requests
+    def status(self):
+        with self._lock:
+            active = {name: snapshot.info() for name, snapshot in self._active.items()}
+            for name, info in active.items():
+                info['building'] = name in self._building
+                info['last_error'] = self._errors.get(name)
+            retired = [ref() for ref in self._retired]
+        return {'models': active,
+                'retired_in_use': [snapshot.info() for snapshot in retired if snapshot is not None]}
@@ -0,0 +1,103 @@
+import re
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from sklearn.feature_extraction.text import CountVectorizer
+
+from catalog import DESTINATIONS_FILE_PATH, REVIEWS_FILE_PATH, build_catalog, canonical_name
+
+# Small travel-review lexicon; a review's sentiment is (positive - negative) / (positive + negative)
+POSITIVE_WORDS = {
+    'amazing', 'awesome', 'beautiful', 'best', 'breathtaking', 'clean', 'enjoyed', 'excellent', 'fantastic',
+    'good', 'great', 'incredible', 'love', 'loved', 'lovely', 'magnificent', 'must', 'nice', 'peaceful',
+    'perfect', 'recommend', 'serene', 'spectacular', 'stunning', 'superb', 'wonder', 'wonderful', 'worth',
+}
+NEGATIVE_WORDS = {
+    'awful', 'bad', 'boring', 'crowded', 'dirty', 'disappointing', 'expensive', 'overrated', 'poor',
+    'rude', 'scam', 'terrible', 'unsafe', 'waste', 'worst',
+}
+
+# Reviews needed before a destination's signal counts at half strength
+SIGNAL_PRIOR_REVIEWS = 10
+
+
+# Sentiment in [-1, 1] for each distinct review string
+def text_sentiment(texts):
+    scores = np.zeros(len(texts), dtype=np.float32)
+    for index, text in enumerate(texts):
+        words = re.findall(r'[a-z]+', str(text).lower())
+        positive = sum(word in POSITIVE_WORDS for word in words)
+        negative = sum(word in NEGATIVE_WORDS for word in words)
+        if positive + negative:
+            scores[index] = (positive - negative) / (positive + negative)
+    return scores
+
+
+# Per-destination review signal. Texts are dictionary-encoded (text_codes index into vocabulary),
+# so sentiment and keywords are computed once per distinct string and then aggregated by code.
+def aggregate_review_signal(place_codes, text_codes, vocabulary, n_places, top_keywords=3):
+    place_codes = np.asarray(place_codes, dtype=np.int32)
+    text_codes = np.asarray(text_codes, dtype=np.int32)
+    keep = (place_codes >= 0) & (text_codes >= 0)
+    place_codes, text_codes = place_codes[keep], text_codes[keep]
+
+    sentiment = text_sentiment(vocabulary)
+    reviews = np.bincount(place_codes, minlength=n_places)
+    totals = np.bincount(place_codes, weights=sentiment[text_codes], minlength=n_places)
+    mean_sentiment = np.divide(totals, reviews, out=np.zeros(n_places), where=reviews > 0)
+
+    # place x distinct-text counts times distinct-text x term counts gives place x term counts
+    usage = coo_matrix((np.ones(len(place_codes), dtype=np.float32), (place_codes, text_codes)),
+                       shape=(n_places, len(vocabulary))).tocsr()
+    vectorizer = CountVectorizer(stop_words='english')
+    try:
+        terms = vectorizer.fit_transform([str(text) for text in vocabulary])
+        term_names = vectorizer.get_feature_names_out()
+        place_terms = (usage @ terms).toarray()
+        top = np.argsort(-place_terms, axis=1)[:, :top_keywords]
+        keywords = [', '.join(term_names[j] for j in row if place_terms[i, j] > 0) for i, row in enumerate(top)]
+    except ValueError:
+        keywords = [''] * n_places
+
+    return pd.DataFrame({
+        'Reviews': reviews,
+        'Sentiment': mean_sentiment,
+        'Signal': mean_sentiment * reviews / (reviews + SIGNAL_PRIOR_REVIEWS),
+        'Keywords': keywords,
+    })
+
+
+def load_review_features(destinations_path=DESTINATIONS_FILE_PATH, reviews_path=REVIEWS_FILE_PATH):
+    catalog, id_map = build_catalog(pd.read_csv(destinations_path))
+    reviews = pd.read_csv(reviews_path, usecols=['DestinationID', 'ReviewText'],
+                          dtype={'DestinationID': 'int32', 'ReviewText': 'category'})
+
+    destination_ids = reviews['DestinationID'].to_numpy(dtype=np.int64)
+    known = (destination_ids >= 0) & (destination_ids < len(id_map))
+    place_codes = np.full(len(reviews), -1, dtype=np.int32)
+    place_codes[known] = id_map[destination_ids[known]]
+
+    texts = reviews['ReviewText']
+    features = aggregate_review_signal(place_codes, texts.cat.codes.to_numpy(), texts.cat.categories,
+                                       len(catalog))
+    return pd.concat([catalog[['PlaceCode', 'Name', 'State']], features], axis=1)
+
+
+# Map catalog destinations onto the hybrid dataset's places: an exact place-name match first,
+# otherwise every place of the city the destination is named after ("Jaipur City" -> Jaipur)
+def review_signal_for_places(features, places):
+    place_keys = canonical_name(places['Place_Name'])
+    city_keys = canonical_name(places['City_Name'])
+    signal = pd.Series(0.0, index=places['Place_Name'].to_numpy())
+
+    for name, value in zip(canonical_name(features['Name']), features['Signal']):
+        matched = (place_keys == name).to_numpy()
+        if not matched.any():
+            matched = city_keys.map(lambda city: bool(city) and (name == city or name.startswith(city + ' '))).to_numpy()
+        signal[matched] += value
+    return signal.groupby(level=0).max()
+
+
+if __name__ == '__main__':
+    print(load_review_features().to_string(index=False))
@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# (city, category) pairs to precompute, most wanted first: live request counts dominate,
+# then how many places the city and the category have in the dataset
+def warmup_targets(data, request_counts=None, default_category='Select a category', max_targets=200):
+    request_counts = request_counts or {}
+    city_counts = data['City_Name'].value_counts()
+    category_counts = data.groupby(['City_Name', 'Category']).size()
+
+    ranked = []
+    for city, city_count in city_counts.items():
+        ranked.append((-request_counts.get((city.lower(), default_category), 0), -city_count, -city_count, city, default_category))
+        for category, category_count in category_counts.loc[city].items():
+            if not category:
+                continue
+            live = request_counts.get((city.lower(), category), 0)
+            ranked.append((-live, -city_count, -category_count, city, category))
+
+    ranked.sort()
+    return [(city, category) for *_, city, category in ranked[:max_targets]]
+
+
+# Raised inside a task by pause() once the scheduler is stopped or out of time
+class WarmupStopped(Exception):
+    pass
+
+
+# Runs task(*target, pause=...) for each target on a small thread pool until the time budget is
+# spent. New work is only handed out while should_yield() is False, and running tasks call pause()
+# between units of work, which blocks while should_yield() is True, so live requests go first.
+class WarmupScheduler:
+    def __init__(self, task, targets, time_budget=20.0, max_workers=1, should_yield=None):
+        self.task = task
+        self.targets = list(targets)
+        self.time_budget = time_budget
+        self.max_workers = max_workers
+        self.should_yield = should_yield or (lambda: False)
+        self.completed = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='warmup-scheduler', daemon=True)
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def status(self):
+        end = self.finished_at or time.monotonic()
+        return {
+            'targets': len(self.targets),
+            'completed': self.completed,
+            'failed': self.failed,
+            'elapsed': round(end - self.started_at, 3) if self.started_at else 0.0,
+            'running': self._thread.is_alive(),
+        }
+
+    def _out_of_time(self):
+        return self._stop.is_set() or time.monotonic() - self.started_at >= self.time_budget
+
+    def pause(self):
+        while self.should_yield() and not self._out_of_time():
+            time.sleep(0.01)
+        if self._out_of_time():
+            raise WarmupStopped()
+
+    def _warm(self, target):
+        try:
+            self.task(*target, pause=self.pause)
+            succeeded = True
+        except WarmupStopped:
+            return
+        except Exception:
+            succeeded = False
+        with self._lock:
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def _run(self):
+        pending = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='warmup') as pool:
+            for target in self.targets:
+                while self.should_yield() and not self._out_of_time():
+                    time.sleep(0.05)
+                while len(pending) >= self.max_workers and not self._out_of_time():
+                    _, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                if self._out_of_time():
+                    break
+                try:
+                    pending.add(pool.submit(self._warm, target))
+                except RuntimeError:
+                    # The interpreter is shutting down and no longer accepts new threads
+                    break
+        self.finished_at = time.monotonic()